@@ -0,0 +1,138 @@
+-- Local SQLite stand-in for the relational reference catalogs served by /api/catalog
+
+CREATE TABLE countries (
+    code TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE departments (
+    code TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    country_code TEXT REFERENCES countries(code),
+    updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE cities (
+    code TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    dept_code TEXT REFERENCES departments(code),
+    updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE campuses (
+    code TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    city_code TEXT REFERENCES cities(code),
+    updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE faculties (
+    code TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    location TEXT,
+    phone_number TEXT,
+    dean_id TEXT,
+    updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE areas (
+    code TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    faculty_code TEXT REFERENCES faculties(code),
+    coordinator_id TEXT,
+    updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE programs (
+    code TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    area_code TEXT REFERENCES areas(code),
+    updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE subjects (
+    code TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    program_code TEXT REFERENCES programs(code),
+    updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE groups (
+    number INTEGER NOT NULL,
+    semester TEXT NOT NULL,
+    subject_code TEXT REFERENCES subjects(code),
+    professor_id TEXT,
+    updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (number, subject_code, semester)
+);
+
+-- DEFAULT CURRENT_TIMESTAMP only fires on INSERT; keep updated_at moving on UPDATE for incremental refreshes
+CREATE TRIGGER countries_updated_at AFTER UPDATE ON countries
+FOR EACH ROW WHEN NEW.updated_at IS OLD.updated_at
+BEGIN
+    UPDATE countries SET updated_at = CURRENT_TIMESTAMP WHERE rowid = NEW.rowid;
+END;
+
+CREATE TRIGGER departments_updated_at AFTER UPDATE ON departments
+FOR EACH ROW WHEN NEW.updated_at IS OLD.updated_at
+BEGIN
+    UPDATE departments SET updated_at = CURRENT_TIMESTAMP WHERE rowid = NEW.rowid;
+END;
+
+CREATE TRIGGER cities_updated_at AFTER UPDATE ON cities
+FOR EACH ROW WHEN NEW.updated_at IS OLD.updated_at
+BEGIN
+    UPDATE cities SET updated_at = CURRENT_TIMESTAMP WHERE rowid = NEW.rowid;
+END;
+
+CREATE TRIGGER campuses_updated_at AFTER UPDATE ON campuses
+FOR EACH ROW WHEN NEW.updated_at IS OLD.updated_at
+BEGIN
+    UPDATE campuses SET updated_at = CURRENT_TIMESTAMP WHERE rowid = NEW.rowid;
+END;
+
+CREATE TRIGGER faculties_updated_at AFTER UPDATE ON faculties
+FOR EACH ROW WHEN NEW.updated_at IS OLD.updated_at
+BEGIN
+    UPDATE faculties SET updated_at = CURRENT_TIMESTAMP WHERE rowid = NEW.rowid;
+END;
+
+CREATE TRIGGER areas_updated_at AFTER UPDATE ON areas
+FOR EACH ROW WHEN NEW.updated_at IS OLD.updated_at
+BEGIN
+    UPDATE areas SET updated_at = CURRENT_TIMESTAMP WHERE rowid = NEW.rowid;
+END;
+
+CREATE TRIGGER programs_updated_at AFTER UPDATE ON programs
+FOR EACH ROW WHEN NEW.updated_at IS OLD.updated_at
+BEGIN
+    UPDATE programs SET updated_at = CURRENT_TIMESTAMP WHERE rowid = NEW.rowid;
+END;
+
+CREATE TRIGGER subjects_updated_at AFTER UPDATE ON subjects
+FOR EACH ROW WHEN NEW.updated_at IS OLD.updated_at
+BEGIN
+    UPDATE subjects SET updated_at = CURRENT_TIMESTAMP WHERE rowid = NEW.rowid;
+END;
+
+CREATE TRIGGER groups_updated_at AFTER UPDATE ON groups
+FOR EACH ROW WHEN NEW.updated_at IS OLD.updated_at
+BEGIN
+    UPDATE groups SET updated_at = CURRENT_TIMESTAMP WHERE rowid = NEW.rowid;
+END;
+
+INSERT INTO countries (code, name) VALUES ('CO', 'Colombia');
+INSERT INTO departments (code, name, country_code) VALUES ('VAC', 'Valle del Cauca', 'CO');
+INSERT INTO cities (code, name, dept_code) VALUES ('CLO', 'Cali', 'VAC');
+INSERT INTO campuses (code, name, city_code) VALUES ('PAN', 'Pance', 'CLO');
+INSERT INTO faculties (code, name, location) VALUES ('FING', 'Engineering', 'Building D');
+INSERT INTO areas (code, name, faculty_code) VALUES ('SIS', 'Systems and Computing', 'FING');
+INSERT INTO programs (code, name, area_code) VALUES ('ISIS', 'Systems Engineering', 'SIS');
+INSERT INTO subjects (code, name, program_code) VALUES ('CS101', 'Introduction to Programming', 'ISIS');
+INSERT INTO subjects (code, name, program_code) VALUES ('CS201', 'Data Structures', 'ISIS');
+INSERT INTO subjects (code, name, program_code) VALUES ('CS302', 'Algorithms', 'ISIS');
+INSERT INTO subjects (code, name, program_code) VALUES ('CS403', 'Database Systems', 'ISIS');
+INSERT INTO groups (number, semester, subject_code, professor_id) VALUES (1, '2024-1', 'CS101', 'A00377013');
+INSERT INTO groups (number, semester, subject_code, professor_id) VALUES (1, '2024-1', 'CS201', 'A00377013');
+INSERT INTO groups (number, semester, subject_code, professor_id) VALUES (2, '2024-2', 'CS201', 'A00377013');
@@ -5,7 +5,14 @@ from pymongo import MongoClient
 from bson.objectid import ObjectId
 from dotenv import load_dotenv
 import json
-from datetime import datetime
+from datetime import datetime, date
+from decimal import Decimal
+from collections import deque
+import threading
+import sqlite3
+import hashlib
+import gzip
+import time
 import uuid
 
 
@@ -198,8 +205,472 @@ def auto_seed_data():
     if student_grades:
         db.student_grades.insert_many(student_grades)
     
+    invalidate_prerequisite_graph()
     print("Auto-seeding completed successfully!")
 
+
+class PrerequisiteGraph:
+    """In-memory prerequisite graph built from the courses collection"""
+
+    def __init__(self, courses):
+        self.courses = {}
+        self.prerequisites = {}
+        for course in courses:
+            code = course.get("code")
+            if not code:
+                continue
+            self.courses[code] = {
+                "code": code,
+                "title": course.get("title"),
+                "credits": course.get("credits")
+            }
+            self.prerequisites[code] = list(dict.fromkeys(course.get("prerequisites") or []))
+
+        for prereqs in list(self.prerequisites.values()):
+            for prereq in prereqs:
+                self.prerequisites.setdefault(prereq, [])
+
+        self.dependents = {code: [] for code in self.prerequisites}
+        for code, prereqs in self.prerequisites.items():
+            for prereq in prereqs:
+                self.dependents[prereq].append(code)
+
+        self.topological_order = self._topological_sort()
+        self.position = {code: i for i, code in enumerate(self.topological_order)}
+        self.cycles = self._find_cycles()
+        self.cyclic = {code for cycle in self.cycles for code in cycle}
+        self.closure = self._transitive_closure()
+
+    def _topological_sort(self):
+        in_degree = {code: len(prereqs) for code, prereqs in self.prerequisites.items()}
+        queue = deque(sorted(code for code, degree in in_degree.items() if degree == 0))
+        order = []
+        while queue:
+            code = queue.popleft()
+            order.append(code)
+            for dependent in sorted(self.dependents[code]):
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    queue.append(dependent)
+        return order
+
+    def _find_cycles(self):
+        """Strongly connected components of the courses that cannot be ordered, via Tarjan's algorithm
+
+        Each component lists every course taking part in a cycle with the others in it.
+        """
+        # Only courses left out of the topological order can be part of a cycle
+        remaining = set(self.prerequisites) - set(self.topological_order)
+        index = {}
+        lowlink = {}
+        stack = []
+        on_stack = set()
+        components = []
+        for start in sorted(remaining):
+            if start in index:
+                continue
+            index[start] = lowlink[start] = len(index)
+            stack.append(start)
+            on_stack.add(start)
+            work = [(start, iter(self.prerequisites[start]))]
+            while work:
+                code, prereqs = work[-1]
+                advanced = False
+                for prereq in prereqs:
+                    if prereq not in remaining:
+                        continue
+                    if prereq not in index:
+                        index[prereq] = lowlink[prereq] = len(index)
+                        stack.append(prereq)
+                        on_stack.add(prereq)
+                        work.append((prereq, iter(self.prerequisites[prereq])))
+                        advanced = True
+                        break
+                    if prereq in on_stack:
+                        lowlink[code] = min(lowlink[code], index[prereq])
+                if advanced:
+                    continue
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[code])
+                if lowlink[code] == index[code]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == code:
+                            break
+                    # Courses only blocked by a cycle form single-course components without a self loop
+                    if len(component) > 1 or code in self.prerequisites[code]:
+                        components.append(sorted(component))
+        return sorted(components)
+
+    def _transitive_closure(self):
+        closure = {}
+        for code in self.topological_order:
+            ancestors = set()
+            for prereq in self.prerequisites[code]:
+                ancestors.add(prereq)
+                ancestors |= closure[prereq]
+            closure[code] = frozenset(ancestors)
+
+        # Courses in or behind a cycle have no topological position, walk them directly
+        for code in self.prerequisites:
+            if code in closure:
+                continue
+            ancestors = set()
+            queue = deque(self.prerequisites[code])
+            while queue:
+                prereq = queue.popleft()
+                if prereq in ancestors:
+                    continue
+                ancestors.add(prereq)
+                queue.extend(self.prerequisites[prereq])
+            ancestors.discard(code)
+            closure[code] = frozenset(ancestors)
+        return closure
+
+    def in_cycle(self, code):
+        return code in self.cyclic
+
+    def chain(self, code):
+        """Every transitive prerequisite of a course, in the order they can be taken"""
+        return sorted(self.closure[code], key=lambda c: (self.position.get(c, len(self.position)), c))
+
+    def eligible_courses(self, completed):
+        completed = set(completed)
+        eligible = []
+        ordered = sorted(self.courses, key=lambda c: (self.position.get(c, len(self.position)), c))
+        for code in ordered:
+            if code in completed or code in self.cyclic:
+                continue
+            if all(prereq in completed for prereq in self.prerequisites[code]):
+                eligible.append(code)
+        return eligible
+
+
+PREREQUISITE_GRAPH_TTL_SECONDS = int(os.getenv("PREREQUISITE_GRAPH_TTL_SECONDS", "600"))
+COMPLETED_COURSE_STATUSES = ["completed", "passed", "approved"]
+
+_prerequisite_graph = None
+_prerequisite_graph_stamp = None
+_prerequisite_graph_built_at = None
+_prerequisite_graph_lock = threading.Lock()
+
+
+def _courses_stamp():
+    """Cheap fingerprint of the courses collection: document count, newest _id and newest updated_at"""
+    summary = list(db.courses.aggregate([
+        {"$group": {
+            "_id": None,
+            "count": {"$sum": 1},
+            "last_id": {"$max": "$_id"},
+            "updated_at": {"$max": "$updated_at"}
+        }}
+    ]))
+    if not summary:
+        return (0, None, None)
+    return (summary[0]["count"], summary[0]["last_id"], summary[0]["updated_at"])
+
+
+def get_prerequisite_graph():
+    """Return the cached graph, rebuilding it when the courses stamp moves or the TTL expires
+
+    The cache is per process, so the stamp catches inserts, deletes and stamped edits made by other
+    workers or directly in Atlas; edits that skip updated_at are picked up once the TTL runs out.
+    """
+    global _prerequisite_graph, _prerequisite_graph_stamp, _prerequisite_graph_built_at
+    stamp = _courses_stamp()
+    with _prerequisite_graph_lock:
+        expired = _prerequisite_graph_built_at is None or time.time() - _prerequisite_graph_built_at > PREREQUISITE_GRAPH_TTL_SECONDS
+        if _prerequisite_graph is None or stamp != _prerequisite_graph_stamp or expired:
+            courses = db.courses.find({}, {"code": 1, "title": 1, "credits": 1, "prerequisites": 1})
+            _prerequisite_graph = PrerequisiteGraph(courses)
+            _prerequisite_graph_stamp = stamp
+            _prerequisite_graph_built_at = time.time()
+        return _prerequisite_graph
+
+
+def invalidate_prerequisite_graph():
+    """Drop the cached graph so it is rebuilt on next use after courses change"""
+    global _prerequisite_graph
+    with _prerequisite_graph_lock:
+        _prerequisite_graph = None
+
+
+CATALOG_DATABASE_URL = os.getenv("CATALOG_DATABASE_URL", "sqlite:///catalog.db")
+CATALOG_REFRESH_SECONDS = int(os.getenv("CATALOG_REFRESH_SECONDS", "300"))
+CATALOG_FULL_RELOAD_EVERY = int(os.getenv("CATALOG_FULL_RELOAD_EVERY", "12"))
+CATALOG_SEED_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "catalog_seed.sql")
+
+# Reference tables mirrored from the relational database, with their key and parent columns
+CATALOG_TABLES = {
+    "countries": {"key": ("code",), "parent": None},
+    "departments": {"key": ("code",), "parent": "country_code"},
+    "cities": {"key": ("code",), "parent": "dept_code"},
+    "campuses": {"key": ("code",), "parent": "city_code"},
+    "faculties": {"key": ("code",), "parent": None},
+    "areas": {"key": ("code",), "parent": "faculty_code"},
+    "programs": {"key": ("code",), "parent": "area_code"},
+    "subjects": {"key": ("code",), "parent": "program_code"},
+    "groups": {"key": ("subject_code", "semester", "number"), "parent": "subject_code"}
+}
+
+# Child table -> (parent table, column) whose name is embedded in each row
+CATALOG_JOINS = {
+    "areas": ("faculties", "faculty_code"),
+    "programs": ("areas", "area_code"),
+    "subjects": ("programs", "program_code"),
+    "groups": ("subjects", "subject_code")
+}
+
+# Query parameter of /api/catalog -> child table filtered by it
+CATALOG_FILTERS = {
+    "country": "departments",
+    "department": "cities",
+    "city": "campuses",
+    "faculty": "areas",
+    "area": "programs",
+    "program": "subjects",
+    "subject": "groups"
+}
+
+
+def connect_catalog_source():
+    """Open the SQL catalog source, returning the connection and its parameter placeholder"""
+    if CATALOG_DATABASE_URL.startswith("sqlite:///"):
+        path = CATALOG_DATABASE_URL[len("sqlite:///"):]
+        if not os.path.isabs(path):
+            path = os.path.join(os.path.dirname(os.path.abspath(__file__)), path)
+        if not os.path.exists(path):
+            # Seed into a temporary file so a failed seed never leaves a half-built catalog behind
+            seeding = f"{path}.seeding"
+            if os.path.exists(seeding):
+                os.remove(seeding)
+            connection = sqlite3.connect(seeding)
+            try:
+                with open(CATALOG_SEED_FILE) as seed:
+                    connection.executescript(seed.read())
+                connection.commit()
+            except Exception:
+                connection.close()
+                os.remove(seeding)
+                raise
+            connection.close()
+            os.replace(seeding, path)
+        return sqlite3.connect(path), "?"
+    
+    import psycopg2
+    return psycopg2.connect(CATALOG_DATABASE_URL), "%s"
+
+
+def _catalog_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+class CatalogSnapshot:
+    """Versioned in-memory copy of the relational reference catalogs"""
+
+    def __init__(self):
+        self.tables = {name: {} for name in CATALOG_TABLES}
+        self.rows = {name: [] for name in CATALOG_TABLES}
+        self.children = {name: {} for name in CATALOG_TABLES}
+        self.digests = {}
+        self.watermarks = {}
+        self.incremental_cycles = {}
+        self.version = None
+        self.refreshed_at = None
+        self.refreshing = False
+        self.lock = threading.Lock()
+        self.refresh_lock = threading.Lock()
+        self._responses = {}
+
+    def refresh(self):
+        """Pull changes from the SQL source into staging and swap them in once every table loaded
+
+        Readers keep serving the current version while the SQL queries run; a refresh that fails
+        partway leaves the snapshot untouched.
+        """
+        with self.refresh_lock:
+            staging = {
+                "tables": dict(self.tables),
+                "rows": dict(self.rows),
+                "children": dict(self.children),
+                "digests": dict(self.digests),
+                "watermarks": dict(self.watermarks),
+                "incremental_cycles": dict(self.incremental_cycles)
+            }
+            connection, placeholder = connect_catalog_source()
+            try:
+                cursor = connection.cursor()
+                changed = [name for name in CATALOG_TABLES if self._refresh_table(staging, cursor, placeholder, name)]
+            finally:
+                connection.close()
+            
+            combined = "".join(staging["digests"][name] for name in CATALOG_TABLES)
+            version = hashlib.sha1(combined.encode()).hexdigest()[:16]
+            with self.lock:
+                for attribute, value in staging.items():
+                    setattr(self, attribute, value)
+                if version != self.version:
+                    self.version = version
+                    self._responses = {}
+                self.refreshed_at = time.time()
+            return changed
+
+    def _fetch(self, cursor, name, watermark):
+        columns = [column[0] for column in cursor.description]
+        rows = {}
+        for record in cursor.fetchall():
+            raw = dict(zip(columns, record))
+            if "updated_at" in raw and raw["updated_at"] is not None:
+                if watermark is None or raw["updated_at"] > watermark:
+                    watermark = raw["updated_at"]
+            row = {column: _catalog_value(value) for column, value in raw.items()}
+            rows[tuple(row.get(column) for column in CATALOG_TABLES[name]["key"])] = row
+        return rows, watermark, "updated_at" in columns
+
+    def _refresh_table(self, staging, cursor, placeholder, name):
+        table = f'"{name}"'
+        watermarks = staging["watermarks"]
+        incremental_cycles = staging["incremental_cycles"]
+        if name in watermarks and incremental_cycles.get(name, 0) < CATALOG_FULL_RELOAD_EVERY:
+            cursor.execute(f"SELECT * FROM {table} WHERE updated_at >= {placeholder}", (watermarks[name],))
+            delta, watermark, _ = self._fetch(cursor, name, watermarks[name])
+            key_columns = ", ".join(f'"{column}"' for column in CATALOG_TABLES[name]["key"])
+            cursor.execute(f"SELECT {key_columns} FROM {table}")
+            keys = {tuple(_catalog_value(value) for value in record) for record in cursor.fetchall()}
+            
+            rows = dict(staging["tables"][name])
+            rows.update(delta)
+            # Deletions and inserts that did not move updated_at past the watermark are caught by
+            # comparing key sets; edits that skip updated_at are only caught by the periodic full reload
+            if set(rows) == keys:
+                watermarks[name] = watermark
+                incremental_cycles[name] = incremental_cycles.get(name, 0) + 1
+                return self._replace(staging, name, rows)
+        
+        incremental_cycles[name] = 0
+        cursor.execute(f"SELECT * FROM {table}")
+        rows, watermark, tracked = self._fetch(cursor, name, None)
+        if tracked and watermark is not None:
+            watermarks[name] = watermark
+        else:
+            watermarks.pop(name, None)
+        return self._replace(staging, name, rows)
+
+    def _replace(self, staging, name, rows):
+        ordered = [rows[key] for key in sorted(rows, key=lambda key: tuple(str(part) for part in key))]
+        digest = hashlib.sha1(json.dumps(ordered, sort_keys=True).encode()).hexdigest()
+        if staging["digests"].get(name) == digest:
+            return False
+        
+        parent = CATALOG_TABLES[name]["parent"]
+        children = {}
+        if parent:
+            for row in ordered:
+                children.setdefault(str(row.get(parent)), []).append(row)
+        
+        staging["tables"][name] = rows
+        staging["rows"][name] = ordered
+        staging["children"][name] = children
+        staging["digests"][name] = digest
+        return True
+
+    def _join(self, name, rows):
+        join = CATALOG_JOINS.get(name)
+        if not join:
+            return rows
+        
+        # Embed the parent's name the way the Supabase loaders did, e.g. subjects -> programs(name)
+        parent_table, column = join
+        parents = self.tables[parent_table]
+        joined = []
+        for row in rows:
+            parent = parents.get((row.get(column),))
+            joined.append({**row, parent_table: {"name": parent.get("name")} if parent else None})
+        return joined
+
+    def select(self, args):
+        filtered = {}
+        for param, name in CATALOG_FILTERS.items():
+            value = args.get(param)
+            if value:
+                filtered[name] = self.children[name].get(value, [])
+        
+        semester = args.get("semester")
+        if semester:
+            groups = filtered.get("groups", self.rows["groups"])
+            filtered["groups"] = [group for group in groups if group.get("semester") == semester]
+        
+        names = catalog_table_names(args.get("tables")) or list(filtered) or list(CATALOG_TABLES)
+        return {name: self._join(name, filtered.get(name, self.rows[name])) for name in names}
+
+    def render(self, args):
+        """Return the ETag, JSON body and gzipped body for a filtered view of the snapshot"""
+        params = sorted((key, value) for key, value in args.items() if key in CATALOG_FILTERS or key in ("semester", "tables"))
+        cache_key = json.dumps(params)
+        cached = self._responses.get(cache_key)
+        if cached:
+            return cached
+        
+        body = json.dumps({"version": self.version, "catalogs": self.select(args)}, separators=(",", ":")).encode()
+        etag = f"{self.version}-{hashlib.sha1(cache_key.encode()).hexdigest()[:12]}"
+        rendered = (etag, body, gzip.compress(body))
+        if len(self._responses) >= 256:
+            self._responses = {}
+        self._responses[cache_key] = rendered
+        return rendered
+
+
+def catalog_table_names(requested):
+    """Parse a comma separated tables= value, ignoring blanks"""
+    if not requested:
+        return []
+    return [name.strip() for name in requested.split(",") if name.strip()]
+
+
+catalog_snapshot = CatalogSnapshot()
+
+
+def _refresh_catalog_in_background():
+    try:
+        catalog_snapshot.refresh()
+    except Exception as error:
+        print(f"Catalog refresh failed, serving version {catalog_snapshot.version}: {error}")
+        with catalog_snapshot.lock:
+            catalog_snapshot.refreshed_at = time.time()
+    finally:
+        with catalog_snapshot.lock:
+            catalog_snapshot.refreshing = False
+
+
+def get_catalog_snapshot(force=False):
+    """Return the catalog snapshot, refreshing it when it is older than CATALOG_REFRESH_SECONDS
+
+    Only the first load and forced refreshes run inside the request; stale snapshots keep being
+    served while a background thread pulls the changes.
+    """
+    if force or catalog_snapshot.version is None:
+        return catalog_snapshot, catalog_snapshot.refresh()
+    
+    with catalog_snapshot.lock:
+        stale = time.time() - catalog_snapshot.refreshed_at > CATALOG_REFRESH_SECONDS
+        start = stale and not catalog_snapshot.refreshing
+        if start:
+            catalog_snapshot.refreshing = True
+    if start:
+        threading.Thread(target=_refresh_catalog_in_background, daemon=True).start()
+    return catalog_snapshot, []
+
 @app.route('/')
 def index():
     return jsonify({"message": "Welcome to TrackAcademic API"})
@@ -259,6 +730,30 @@ def delete_course(subject_code):
     
     return jsonify({"success": True, "message": f"Course {subject_code} deleted"})
 
+@app.route('/api/courses/<subject_code>/prerequisites', methods=['GET'])
+def get_course_prerequisites(subject_code):
+    graph = get_prerequisite_graph()
+    if subject_code not in graph.prerequisites:
+        return jsonify({"error": f"Course {subject_code} not found"}), 404
+    
+    chain = graph.chain(subject_code)
+    return jsonify({
+        "subject_code": subject_code,
+        "direct": graph.prerequisites[subject_code],
+        "chain": chain,
+        "courses": [graph.courses.get(code, {"code": code}) for code in chain],
+        "in_cycle": graph.in_cycle(subject_code)
+    })
+
+@app.route('/api/prerequisites/cycles', methods=['GET'])
+def get_prerequisite_cycles():
+    graph = get_prerequisite_graph()
+    return jsonify({
+        "has_cycles": bool(graph.cycles),
+        "cycles": graph.cycles,
+        "topological_order": graph.topological_order
+    })
+
 
 @app.route('/api/evaluation-plans', methods=['GET'])
 def get_evaluation_plans():
@@ -319,6 +814,44 @@ def seed_data():
     auto_seed_data()
     return jsonify({"message": "Demo data has been seeded for student A00377013"})
 
+@app.route('/api/catalog', methods=['GET'])
+def get_catalog():
+    try:
+        snapshot, _ = get_catalog_snapshot()
+    except Exception as error:
+        return jsonify({"error": f"Catalog source unavailable: {error}"}), 503
+    
+    unknown = [name for name in catalog_table_names(request.args.get('tables')) if name not in CATALOG_TABLES]
+    if unknown:
+        return jsonify({"error": f"Unknown catalog tables: {', '.join(unknown)}"}), 400
+    
+    with snapshot.lock:
+        etag, body, compressed = snapshot.render(request.args)
+    
+    if "gzip" in request.accept_encodings:
+        response = app.response_class(compressed, mimetype="application/json")
+        response.headers["Content-Encoding"] = "gzip"
+        etag = f"{etag}-gzip"
+    else:
+        response = app.response_class(body, mimetype="application/json")
+    response.headers["Vary"] = "Accept-Encoding"
+    response.headers["X-Catalog-Version"] = snapshot.version
+    response.cache_control.no_cache = True
+    response.set_etag(etag)
+    return response.make_conditional(request)
+
+@app.route('/api/catalog/refresh', methods=['POST'])
+def refresh_catalog():
+    secret_key = request.headers.get('X-Admin-Key')
+    if secret_key != os.getenv('ADMIN_SECRET', 'admin_secret_key'):
+        return jsonify({"error": "Unauthorized"}), 401
+    
+    try:
+        snapshot, changed = get_catalog_snapshot(force=True)
+    except Exception as error:
+        return jsonify({"error": f"Catalog source unavailable: {error}"}), 503
+    return jsonify({"version": snapshot.version, "changed": changed})
+
 @app.route('/api/student-grades', methods=['GET'])
 def get_student_grades():
     evaluation_plan_id = request.args.get('evaluation_plan_id')
@@ -529,6 +1062,27 @@ def get_student_courses():
     courses = list(db.student_courses.find(query))
     return jsonify(courses)
 
+@app.route('/api/student-courses/eligible/<student_id>', methods=['GET'])
+def get_eligible_courses(student_id):
+    enrollments = db.student_courses.find({"student_id": student_id}, {"subject_code": 1, "status": 1})
+    completed = set()
+    in_progress = set()
+    for enrollment in enrollments:
+        if enrollment.get("status") in COMPLETED_COURSE_STATUSES:
+            completed.add(enrollment["subject_code"])
+        else:
+            in_progress.add(enrollment["subject_code"])
+    in_progress -= completed
+    
+    graph = get_prerequisite_graph()
+    eligible = [code for code in graph.eligible_courses(completed) if code not in in_progress]
+    return jsonify({
+        "student_id": student_id,
+        "completed": sorted(completed),
+        "in_progress": sorted(in_progress),
+        "eligible": [graph.courses[code] for code in eligible]
+    })
+
 @app.route('/api/student-courses/<subject_code>', methods=['GET'])
 def get_student_course(subject_code):
     course = db.student_courses.find_one({"_id": subject_code})
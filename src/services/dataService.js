@@ -27,34 +27,34 @@ const apiRequest = async (endpoint, options = {}) => {
   }
 };
 
+export const getCatalog = async (filters = {}) => {
+  const queryParams = new URLSearchParams();
+  Object.entries(filters).forEach(([key, value]) => {
+    if (value) queryParams.append(key, value);
+  });
+  
+  const endpoint = `/catalog${queryParams.toString() ? '?' + queryParams.toString() : ''}`;
+  return await apiRequest(endpoint);
+};
+
 export const getCountries = async () => {
-  const { data, error } = await supabase.from('countries').select('*');
-  if (error) throw error;
-  return data;
+  const { catalogs } = await getCatalog({ tables: 'countries' });
+  return catalogs.countries;
 };
 
 export const getDepartments = async (countryCode = null) => {
-  let query = supabase.from('departments').select('*');
-  if (countryCode) query = query.eq('country_code', countryCode);
-  const { data, error } = await query;
-  if (error) throw error;
-  return data;
+  const { catalogs } = await getCatalog({ tables: 'departments', country: countryCode });
+  return catalogs.departments;
 };
 
 export const getCities = async (deptCode = null) => {
-  let query = supabase.from('cities').select('*');
-  if (deptCode) query = query.eq('dept_code', deptCode);
-  const { data, error } = await query;
-  if (error) throw error;
-  return data;
+  const { catalogs } = await getCatalog({ tables: 'cities', department: deptCode });
+  return catalogs.cities;
 };
 
 export const getCampuses = async (cityCode = null) => {
-  let query = supabase.from('campuses').select('*');
-  if (cityCode) query = query.eq('city_code', cityCode);
-  const { data, error } = await query;
-  if (error) throw error;
-  return data;
+  const { catalogs } = await getCatalog({ tables: 'campuses', city: cityCode });
+  return catalogs.campuses;
 };
 
 export const getFaculties = async () => {
@@ -83,29 +83,13 @@ export const getAreas = async (facultyCode = null) => {
 };
 
 export const getPrograms = async (areaCode = null) => {
-  let query = supabase
-    .from('programs')
-    .select(`
-      *,
-      areas (name)
-    `);
-  if (areaCode) query = query.eq('area_code', areaCode);
-  const { data, error } = await query;
-  if (error) throw error;
-  return data;
+  const { catalogs } = await getCatalog({ tables: 'programs', area: areaCode });
+  return catalogs.programs;
 };
 
 export const getSubjects = async (programCode = null) => {
-  let query = supabase
-    .from('subjects')
-    .select(`
-      *,
-      programs (name)
-    `);
-  if (programCode) query = query.eq('program_code', programCode);
-  const { data, error } = await query;
-  if (error) throw error;
-  return data;
+  const { catalogs } = await getCatalog({ tables: 'subjects', program: programCode });
+  return catalogs.subjects;
 };
 
 export const getGroups = async (subjectCode = null, semester = null) => {